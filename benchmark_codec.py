@@ -0,0 +1,179 @@
+import json
+import sys
+import time
+import codec
+
+ROUNDS = 5
+VERSION_COUNTS = (100, 1000, 5000)  # Roughly small, typical and very large (multi-MB) packuments
+
+
+def make_packument(version_count):
+    """Build a synthetic packument shaped like a registry.npmjs.org response."""
+    versions = {}
+    times = {}
+    for i in range(version_count):
+        version = f"1.{i // 100}.{i % 100}"
+        versions[version] = {
+            "name": "@scope/example",
+            "version": version,
+            "description": "An example package used to benchmark the ingest codec – with unicode",
+            "main": "index.js",
+            "license": "MIT",
+            "repository": {"type": "git", "url": "git+https://github.com/scope/example.git"},
+            "dependencies": {f"dependency-{d}": f"^{d}.0.0" for d in range(15)},
+            "devDependencies": {f"dev-dependency-{d}": f"~{d}.1.0" for d in range(25)},
+            "scripts": {"test": "jest", "build": "tsc -p .", "lint": "eslint ."},
+            "maintainers": [{"name": f"maintainer-{m}", "email": f"m{m}@example.com"} for m in range(3)],
+            "dist": {
+                "shasum": "0" * 40,
+                "tarball": f"https://registry.npmjs.org/@scope/example/-/example-{version}.tgz",
+                "integrity": "sha512-" + "A" * 86 + "==",
+                "fileCount": 42,
+                "unpackedSize": 123456
+            },
+            "_npmUser": {"name": "publisher", "email": "publisher@example.com"}
+        }
+        times[version] = "2020-01-01T00:00:00.000Z"
+    times["created"] = times["modified"] = "2020-01-01T00:00:00.000Z"
+    return {
+        "_id": "@scope/example",
+        "name": "@scope/example",
+        "description": "Broken\u0000 description with a NUL character 🚀",
+        "dist-tags": {"latest": version},
+        "versions": versions,
+        "time": times,
+        "readme": "# Example 🚀\n" * 2000  # Characters outside the BMP are common in readmes
+    }
+
+
+def make_libraries_io_project(version_count):
+    """Build a synthetic project shaped like a Libraries.io search result."""
+    return {
+        "name": "@scope/example",
+        "platform": "NPM",
+        "description": "An example package used to benchmark the ingest codec 🚀",
+        "homepage": "https://example.com",
+        "language": "TypeScript",
+        "repository_url": "https://github.com/scope/example",
+        "package_manager_url": "https://www.npmjs.com/package/@scope/example",
+        "rank": 20,
+        "stars": 1234,
+        "forks": 56,
+        "keywords": ["example", "benchmark", "codec"],
+        "normalized_licenses": ["MIT"],
+        "latest_release_number": f"1.{(version_count - 1) // 100}.{(version_count - 1) % 100}",
+        "versions": [{
+            "number": f"1.{i // 100}.{i % 100}",
+            "published_at": "2020-01-01T00:00:00.000Z",
+            "spdx_expression": "MIT",
+            "original_license": "MIT",
+            "researched_at": None,
+            "repository_sources": ["NPM"]
+        } for i in range(version_count)]
+    }
+
+
+def check_codec():
+    """Assert that every available backend sanitizes the same way before timing anything."""
+    cases = [
+        ({"k": "a\u0000b"}, {"k": "ab"}),  # NUL character
+        ({"k\u0000": "v"}, {"k": "v"}),  # NUL character inside an object key
+        ({"k": "a\\u0000b"}, {"k": "a\\u0000b"}),  # Escaped backslash followed by "u0000"
+        ({"k": "a\\\u0000b"}, {"k": "a\\b"}),  # Escaped backslash followed by a NUL character
+        ({"k": "\u0000\u0000"}, {"k": ""}),
+        ({"k": "\ud800x"}, {"k": "x"}),  # Unpaired high surrogate
+        ({"k": "x\udc00"}, {"k": "x"}),  # Unpaired low surrogate
+        ({"k": "\udc00\ud800"}, {"k": ""}),  # Surrogates in the wrong order
+        ({"k": "a\\ud800"}, {"k": "a\\ud800"}),  # Escaped backslash followed by "ud800"
+        ({"k": "🚀\ud800–\u0000"}, {"k": "🚀–"})  # Characters outside the BMP are kept
+    ]
+    backends = [codec.orjson, None] if codec.orjson else [None]
+    fast_backend = codec.orjson
+    outputs = []
+    try:
+        for backend in backends:
+            codec.orjson = backend
+            output = [codec.dumps(data) for data, _ in cases]
+            for json_string, (data, expected) in zip(output, cases):
+                assert json.loads(json_string) == expected, (backend, data, json_string)
+            # Registry data may contain unpaired surrogate escapes that must still parse
+            assert json.loads(codec.dumps(codec.loads(b'{"a":"\\ud800x"}'))) == {"a": "x"}, backend
+            outputs.append(output)
+    finally:
+        codec.orjson = fast_backend
+
+    # Backends only differ in whether non-ASCII characters are escaped
+    for json_strings in zip(*outputs):
+        if all(json_string.isascii() for json_string in json_strings):
+            assert len(set(json_strings)) == 1, json_strings
+    print("✅ [SUCCESS] Codec self-checks passed.")
+
+
+def legacy_packument_pipeline(content):
+    """The previous direct_npm path: parse, dump, clean, then clean again in update_database."""
+    raw = json.dumps(json.loads(content), ensure_ascii=True)
+    raw = raw.replace("\u0000", "").encode("utf-8", "ignore").decode("utf-8")
+    return raw.replace("\u0000", "").encode("utf-8", "ignore").decode("utf-8")
+
+
+def codec_packument_pipeline(content):
+    return codec.dumps(codec.loads(content))
+
+
+def legacy_project_pipeline(project):
+    """The previous insert_projects path: `versions` and the whole project are dumped separately."""
+    return json.dumps(project.get("versions", [])), json.dumps(project)
+
+
+def codec_project_pipeline(project):
+    return codec.dumps(project)
+
+
+def measure(pipeline, content):
+    """Return the best wall-clock time in milliseconds over `ROUNDS` runs."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        pipeline(content)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(name, size, content, legacy_pipeline, codec_pipeline):
+    fast_backend = codec.orjson
+    legacy = measure(legacy_pipeline, content)
+    fast = measure(codec_pipeline, content) if fast_backend else None
+    codec.orjson = None  # Force the standard-library fallback
+    try:
+        fallback = measure(codec_pipeline, content)
+    finally:
+        codec.orjson = fast_backend
+
+    print(f"📦 {name} ({size / 1024 / 1024:.2f} MB)")
+    print(f"   legacy:   {legacy:8.2f} ms")
+    print(f"   stdlib:   {fallback:8.2f} ms ({legacy / fallback:.1f}x)")
+    if fast is not None:
+        print(f"   orjson:   {fast:8.2f} ms ({legacy / fast:.1f}x)")
+    else:
+        print("   orjson:   not installed")
+
+
+if __name__ == "__main__":
+    check_codec()
+
+    # Pass paths to saved packuments (e.g. `curl https://registry.npmjs.org/typescript > typescript.json`)
+    # to benchmark real data; otherwise synthetic data of realistic sizes is used.
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                content = f.read()
+            run(path, len(content), content, legacy_packument_pipeline, codec_packument_pipeline)
+    else:
+        for version_count in VERSION_COUNTS:
+            content = json.dumps(make_packument(version_count)).encode("utf-8")
+            run(f"direct_npm packument with {version_count} versions", len(content), content,
+                legacy_packument_pipeline, codec_packument_pipeline)
+        for version_count in VERSION_COUNTS:
+            project = make_libraries_io_project(version_count)
+            run(f"Libraries.io project with {version_count} versions", len(json.dumps(project)), project,
+                legacy_project_pipeline, codec_project_pipeline)
@@ -0,0 +1,51 @@
+import json
+import re
+
+try:
+    import orjson  # Optional fast JSON backend
+except ImportError:
+    orjson = None
+
+# Every alternative starts with a backslash so the search can skip ahead to the next one.
+# Escaped backslashes are matched and written back (`\1\1`) so that only real escapes are removed.
+INVALID_ESCAPES = re.compile(
+    r"\\(?:"
+    r"(\\)"
+    r"|u0000"
+    r"|ud[89ab][0-9a-f]{2}(?!\\ud[c-f])"  # High surrogate without a low one
+    r"|(?<!\\ud[89ab][0-9a-f]{2}\\)ud[c-f][0-9a-f]{2}"  # Low surrogate without a high one
+    r")"
+)
+INVALID_ESCAPES_BYTES = re.compile(rb"\\(?:(\\)|u0000)")  # orjson never writes surrogate escapes
+
+
+def loads(content):
+    """Parse JSON from bytes or str using the fastest available backend."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass  # e.g. lone surrogate escapes, which `dumps` drops instead of rejecting the document
+    return json.loads(content)
+
+
+def dumps(data):
+    """Serialize data to a JSON string that Postgres accepts as `jsonb`.
+
+    NUL characters and unpaired surrogates, which `jsonb` rejects, are dropped from the
+    serialized text in a single regular expression pass, and only if the text contains them.
+    """
+    if orjson is not None:
+        try:
+            json_bytes = orjson.dumps(data)
+        except TypeError:
+            pass  # e.g. unpaired surrogates or integers wider than 64 bits
+        else:
+            if b"\\u0000" in json_bytes:
+                json_bytes = INVALID_ESCAPES_BYTES.sub(rb"\1\1", json_bytes)
+            return json_bytes.decode("utf-8")  # psycopg2 sends bytes as `bytea`, not as text
+    # ASCII output is the fastest standard-library mode
+    json_string = json.dumps(data, separators=(",", ":"))
+    if "\\u0000" in json_string or "\\ud" in json_string:
+        json_string = INVALID_ESCAPES.sub(r"\1\1", json_string)
+    return json_string
@@ -1,8 +1,10 @@
 import os
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
-import json
+import codec
+from repositories import merge_repositories, unstored_repositories, mark_repositories_stored, normalize_repository_url
 
 # Load environment variables
 load_dotenv()
@@ -53,10 +55,40 @@ def create_tables():
                     latest_stable_release_published_at TIMESTAMP,
                     versions JSONB,
                     raw JSONB,
+                    repository_key TEXT,
                     UNIQUE(name, platform)
                 );
 
+                CREATE TABLE IF NOT EXISTS Repositories (
+                    url TEXT PRIMARY KEY,
+                    language TEXT,
+                    stars INTEGER,
+                    forks INTEGER,
+                    contributions_count INTEGER,
+                    updated_at TIMESTAMP DEFAULT NOW()
+                );
+
+                -- Databases created before repository-level enrichment lack this column
+                ALTER TABLE Projects ADD COLUMN IF NOT EXISTS repository_key TEXT;
+
                 CREATE INDEX IF NOT EXISTS idx_project_name ON Projects(name);
+                CREATE INDEX IF NOT EXISTS idx_project_repository_key ON Projects(repository_key);
+
+                -- Projects with the current metadata of their shared repository
+                CREATE OR REPLACE VIEW ProjectsWithRepositories AS
+                SELECT
+                    p.id, p.name, p.platform, p.description, p.homepage,
+                    COALESCE(r.language, p.language) AS language,
+                    p.repository_url, p.package_manager_url, p.rank,
+                    COALESCE(r.stars, p.stars) AS stars,
+                    COALESCE(r.forks, p.forks) AS forks,
+                    r.contributions_count,
+                    p.keywords, p.funding_urls, p.normalized_licenses,
+                    p.latest_release_number, p.latest_release_published_at,
+                    p.latest_stable_release_number, p.latest_stable_release_published_at,
+                    p.versions, p.raw, p.repository_key
+                FROM Projects AS p
+                LEFT JOIN Repositories AS r ON r.url = p.repository_key;
             """)
             conn.commit()
 
@@ -82,28 +114,57 @@ def insert_platforms(platforms):
                 ))
             conn.commit()
 
+def upsert_repositories(cur, repositories):
+    """Insert or update repository-level metadata, one row per normalized repository URL.
+
+    Rows are written in key order so that concurrent jobs lock shared repositories in the same order.
+    """
+    execute_values(cur, """
+        INSERT INTO Repositories (url, language, stars, forks, contributions_count)
+        VALUES %s
+        ON CONFLICT (url) DO UPDATE SET
+            language = COALESCE(EXCLUDED.language, Repositories.language),
+            stars = COALESCE(EXCLUDED.stars, Repositories.stars),
+            forks = COALESCE(EXCLUDED.forks, Repositories.forks),
+            contributions_count = COALESCE(EXCLUDED.contributions_count, Repositories.contributions_count),
+            updated_at = NOW();
+    """, [(
+        key, metadata["language"], metadata["stars"], metadata["forks"], metadata["contributions_count"]
+    ) for key, metadata in sorted(repositories.items())])
+
 def insert_projects(platform, projects):
-    """Insert projects into the database."""
+    """Insert projects into the database and store their repositories once per repository.
+
+    The repository-level columns of every project are filled from its repository's merged metadata.
+    """
+    repositories = merge_repositories(projects)
+    pending = unstored_repositories(repositories)
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             for project in projects:
+                repository_key = normalize_repository_url(project.get("repository_url"))
+                shared = repositories.get(repository_key, project)  # Values shared by all member packages
+                raw = codec.dumps(project)  # Serialized and sent once; `versions` is taken from it by Postgres
                 cur.execute("""
+                    WITH data AS (SELECT %s::jsonb AS raw)
                     INSERT INTO Projects (
                         name, platform, description, homepage, language, repository_url, 
                         package_manager_url, rank, stars, forks, keywords, funding_urls, 
                         normalized_licenses, latest_release_number, latest_release_published_at, 
-                        latest_stable_release_number, latest_stable_release_published_at, versions, raw
+                        latest_stable_release_number, latest_stable_release_published_at, versions, raw,
+                        repository_key
                     ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                        (SELECT COALESCE(raw -> 'versions', '[]'::jsonb) FROM data), (SELECT raw FROM data), %s
                     ) ON CONFLICT (name, platform) DO UPDATE SET
                         description = EXCLUDED.description,
                         homepage = EXCLUDED.homepage,
-                        language = EXCLUDED.language,
+                        language = COALESCE(EXCLUDED.language, Projects.language),
                         repository_url = EXCLUDED.repository_url,
                         package_manager_url = EXCLUDED.package_manager_url,
                         rank = EXCLUDED.rank,
-                        stars = EXCLUDED.stars,
-                        forks = EXCLUDED.forks,
+                        stars = COALESCE(EXCLUDED.stars, Projects.stars),
+                        forks = COALESCE(EXCLUDED.forks, Projects.forks),
                         keywords = EXCLUDED.keywords,
                         funding_urls = EXCLUDED.funding_urls,
                         normalized_licenses = EXCLUDED.normalized_licenses,
@@ -112,18 +173,21 @@ def insert_projects(platform, projects):
                         latest_stable_release_number = EXCLUDED.latest_stable_release_number,
                         latest_stable_release_published_at = EXCLUDED.latest_stable_release_published_at,
                         versions = EXCLUDED.versions,
-                        raw = EXCLUDED.raw;
+                        raw = EXCLUDED.raw,
+                        repository_key = EXCLUDED.repository_key;
                 """, (
-                    project["name"], platform, project.get("description"), project.get("homepage"),
-                    project.get("language"), project.get("repository_url"), project.get("package_manager_url"),
-                    project.get("rank"), project.get("stars"), project.get("forks"),
+                    raw, project["name"], platform, project.get("description"), project.get("homepage"),
+                    shared.get("language"), project.get("repository_url"), project.get("package_manager_url"),
+                    project.get("rank"), shared.get("stars"), shared.get("forks"),
                     project.get("keywords", []), project.get("funding_urls", []),
                     project.get("normalized_licenses", []), project.get("latest_release_number"),
                     project.get("latest_release_published_at"), project.get("latest_stable_release_number"),
-                    project.get("latest_stable_release_published_at"), json.dumps(project.get("versions", [])),
-                    json.dumps(project)
+                    project.get("latest_stable_release_published_at"), repository_key
                 ))
+            if pending:
+                upsert_repositories(cur, pending)
             conn.commit()
+    mark_repositories_stored(pending)
 
 def count_npm_packages():
     """Counts total NPM packages in the database."""
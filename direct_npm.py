@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 import os
 import json
 from datetime import datetime
+import codec
+from database import create_tables
+from repositories import normalize_repository_url
 
 # Load environment variables
 load_dotenv()
@@ -33,7 +36,7 @@ def fetch_npm_data(package_name):
         response = requests.get(url, timeout=5)
         if response.status_code == 200:
             try:
-                return response.json()  # Ensure response is valid JSON
+                return codec.loads(response.content)  # Ensure response is valid JSON
             except json.JSONDecodeError:
                 print(f"Invalid JSON response for {package_name}")
                 return None
@@ -57,8 +60,7 @@ def parse_timestamp(timestamp):
 def clean_json_data(npm_data):
     """Ensure JSON data is sanitized for storage."""
     try:
-        json_string = json.dumps(npm_data, ensure_ascii=True)
-        return json_string.replace("\u0000", "").encode("utf-8", "ignore").decode("utf-8")  # Remove null characters
+        return codec.dumps(npm_data)  # Serializes and removes null characters in one pass
     except (TypeError, ValueError):
         return "{}"  # Return empty JSON string if there's an issue
 
@@ -85,6 +87,7 @@ def extract_data(npm_data):
         "description": npm_data.get("description"),
         "homepage": npm_data.get("homepage"),
         "repository_url": repository_url,
+        "repository_key": normalize_repository_url(repository_url),
         "latest_release_number": latest_release_number,
         "latest_release_published_at": latest_release_published_at,
         "raw": clean_json_data(npm_data)  # Sanitize JSON before storage
@@ -100,14 +103,16 @@ def update_database(updates):
             repository_url = COALESCE(data.repository_url, p.repository_url),
             latest_release_number = COALESCE(data.latest_release_number, p.latest_release_number),
             latest_release_published_at = COALESCE(data.latest_release_published_at::timestamp, p.latest_release_published_at),
-            raw = COALESCE(data.raw::jsonb, p.raw)
-        FROM (VALUES %s) AS data(id, description, homepage, repository_url, latest_release_number, latest_release_published_at, raw)
+            raw = COALESCE(data.raw::jsonb, p.raw),
+            repository_key = COALESCE(data.repository_key, p.repository_key)
+        FROM (VALUES %s) AS data(id, description, homepage, repository_url, latest_release_number, latest_release_published_at, raw, repository_key)
         WHERE p.id = data.id;
     """
     clean_updates = [(
         project_id, description, homepage, repository_url, latest_release_number,
-        latest_release_published_at, raw.replace("\u0000", "").encode("utf-8", "ignore").decode("utf-8") if raw else "{}"
-    ) for project_id, description, homepage, repository_url, latest_release_number, latest_release_published_at, raw in updates]
+        latest_release_published_at, raw or "{}",  # Already sanitized by clean_json_data
+        repository_key
+    ) for project_id, description, homepage, repository_url, latest_release_number, latest_release_published_at, raw, repository_key in updates]
     execute_values(cursor, query, clean_updates)
     conn.commit()
 
@@ -136,7 +141,8 @@ def process_batches():
                         updates.append((
                             project_id, extracted_data["description"], extracted_data["homepage"],
                             extracted_data["repository_url"], extracted_data["latest_release_number"],
-                            extracted_data["latest_release_published_at"], extracted_data["raw"]
+                            extracted_data["latest_release_published_at"], extracted_data["raw"],
+                            extracted_data["repository_key"]
                         ))
             except:
                 pass
@@ -151,9 +157,13 @@ def process_batches():
         offset += BATCH_SIZE
         time.sleep(2)  # Avoid API rate limits
 
-# Run the batch update process
-process_batches()
+if __name__ == "__main__":
+    # Make sure the `repository_key` column exists
+    create_tables()
 
-# Close database connection
-cursor.close()
-conn.close()
+    # Run the batch update process
+    process_batches()
+
+    # Close database connection
+    cursor.close()
+    conn.close()
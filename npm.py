@@ -175,10 +175,15 @@ def update_npm_projects(batch_size=DEFAULT_MAX_REQUESTS_PER_MINUTE):
         print(f"🔍 [INFO] Processing batch {offset // batch_size + 1} ({len(npm_packages)} packages).", flush=True)
 
         projects = []
+        fetched_packages = set()  # A search can also return other packages of this batch
         for package in npm_packages:
+            if package in fetched_packages:
+                print(f"⏭️ [INFO] '{package}' was already returned by an earlier search in this batch. Skipping.", flush=True)
+                continue
             project = fetch_npm_project(package)
             if project:
                 projects.extend(project)
+                fetched_packages.update(result.get("name") for result in project)
 
         if projects:
             print(f"📥 [INFO] Inserting {len(projects)} projects into the database.", flush=True)
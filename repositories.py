@@ -0,0 +1,118 @@
+import re
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+# Repository-level fields of a Libraries.io project; identical for every package in a monorepo
+REPOSITORY_FIELDS = ("language", "stars", "forks", "contributions_count")
+
+# Hosts whose repositories are addressed by exactly `owner/name`
+OWNER_NAME_HOSTS = {"github.com", "bitbucket.org"}
+SHORTCUT_HOSTS = {
+    "github": "github.com",
+    "gitlab": "gitlab.com",
+    "bitbucket": "bitbucket.org",
+    "gist": "gist.github.com"
+}
+SHORTCUT_URL = re.compile(r"^(github|gitlab|bitbucket|gist):(.+)$")
+SCP_LIKE_URL = re.compile(r"^(?:[\w.-]+@)?([\w.-]+\.[\w.-]+):(?!//)(.+)$")
+OWNER_NAME_URL = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+# Repository metadata already stored during this run, keyed by normalized repository URL
+MAX_CACHED_REPOSITORIES = 100000
+repository_cache = OrderedDict()
+
+
+def normalize_repository_url(url):
+    """Normalize a repository URL so that all packages of one repository share a single key.
+
+    Handles `git+`, `git://`, `ssh://`, scp-like (`git@host:owner/name`) and npm shortcut
+    (`github:owner/name`, `owner/name`) forms. Returns None if no repository can be derived.
+    """
+    if not isinstance(url, str):
+        return None
+
+    url = url.strip()
+    if url.startswith("git+"):
+        url = url[4:]  # Remove "git+"
+    if not url:
+        return None
+
+    if "://" in url:
+        parts = urlsplit(url)
+        host, path = parts.hostname, parts.path
+    elif match := SHORTCUT_URL.match(url):
+        host, path = SHORTCUT_HOSTS[match.group(1)], match.group(2)
+    elif match := SCP_LIKE_URL.match(url):
+        host, path = match.group(1), match.group(2)
+    elif OWNER_NAME_URL.match(url):
+        host, path = "github.com", url  # npm treats bare `owner/name` as a GitHub repository
+    else:
+        return None
+
+    if not host:
+        return None
+    host = host.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = path.split("#", 1)[0].strip("/")
+    segments = [segment for segment in path.split("/") if segment]
+    if "-" in segments:
+        segments = segments[:segments.index("-")]  # GitLab-style `/-/tree/main/packages/...` suffixes
+    if host in OWNER_NAME_HOSTS:
+        if len(segments) < 2:
+            return None  # An owner or organization page, not a repository
+        segments = segments[:2]  # Drop `/tree/main/packages/...` style suffixes
+    if segments and segments[-1].endswith(".git"):
+        segments[-1] = segments[-1][:-4]
+    if not segments or not segments[-1]:
+        return None
+
+    return f"https://{host}/{'/'.join(segments)}".lower()
+
+
+def extract_repository(project):
+    """Return `(key, metadata)` for the repository of a Libraries.io project, or None."""
+    key = normalize_repository_url(project.get("repository_url"))
+    if not key:
+        return None
+    return key, {field: project.get(field) for field in REPOSITORY_FIELDS}
+
+
+def merge_repositories(projects):
+    """Return the repository metadata of `projects`, keyed by normalized repository URL.
+
+    Each repository appears once, however many of its member packages are in `projects`.
+    Every field takes the first non-null value among the members, then the stored one.
+    """
+    repositories = {}
+    for project in projects:
+        repository = extract_repository(project)
+        if not repository:
+            continue
+        key, metadata = repository
+        merged = repositories.setdefault(key, metadata)
+        for field, value in metadata.items():
+            if merged[field] is None:
+                merged[field] = value
+
+    for key, merged in repositories.items():
+        stored = repository_cache.get(key)
+        if stored:
+            for field, value in stored.items():
+                if merged[field] is None:
+                    merged[field] = value
+    return repositories
+
+
+def unstored_repositories(repositories):
+    """Return the repositories whose metadata has not been stored during this run."""
+    return {key: metadata for key, metadata in repositories.items() if repository_cache.get(key) != metadata}
+
+
+def mark_repositories_stored(repositories):
+    """Remember stored repositories so later batches do not write them again."""
+    for key, metadata in repositories.items():
+        repository_cache[key] = metadata
+        repository_cache.move_to_end(key)
+    while len(repository_cache) > MAX_CACHED_REPOSITORIES:
+        repository_cache.popitem(last=False)  # Forget the least recently stored repository